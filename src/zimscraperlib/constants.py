@@ -12,8 +12,8 @@ DEFAULT_USER_AGENT = f"{NAME}/{__version__} ({CONTACT})"
 
 UTF8 = "UTF-8"
 
-# list of Image formats witout Alpha Channel support
-ALPHA_NOT_SUPPORTED = ["JPEG", "BMP", "EPS", "PCX"]
+# set of Image formats witout Alpha Channel support
+ALPHA_NOT_SUPPORTED = frozenset({"JPEG", "BMP", "EPS", "PCX"})
 
 # list of mimetypes we consider articles using it should default to FRONT_ARTICLE
 FRONT_ARTICLE_MIMETYPES = ["text/html"]
@@ -1,8 +1,5 @@
 import re
-
-import babel
-import iso639  # pyright: ignore[reportMissingTypeStubs]
-import iso639.exceptions  # pyright: ignore[reportMissingTypeStubs]
+import sys
 
 ISO_LEVELS = ["1", "2b", "2t", "3", "5"]
 
@@ -10,6 +7,11 @@ ISO_LEVELS = ["1", "2b", "2t", "3", "5"]
 class NotFoundError(ValueError): ...
 
 
+def _intern_or_none(code: str | None) -> str | None:
+    """interned code or None if code is empty"""
+    return sys.intern(code) if code else None
+
+
 class Language:
     """Qualified ISO-639-3 language"""
 
@@ -51,6 +53,10 @@ class Language:
 
         adjusted_query, self.native_query, self.querytype = get_adjusted_query(query)
 
+        # imported on first use as loading ISO-639 and CLDR data is expensive
+        import iso639  # pyright: ignore[reportMissingTypeStubs]
+        import iso639.exceptions  # pyright: ignore[reportMissingTypeStubs]
+
         try:
             isolang = iso639.Lang(adjusted_query)
         except (
@@ -68,11 +74,13 @@ class Language:
             "english": "name",
         }
 
-        self.iso_639_1 = isolang.pt1 or None
-        self.iso_639_2b = isolang.pt2b or None
-        self.iso_639_2t = isolang.pt2t or None
-        self.iso_639_3 = isolang.pt3 or None
-        self.iso_639_5 = isolang.pt5 or None
+        # codes are interned so that all languages share the same code objects,
+        # comparing on the identity fast path of str equality
+        self.iso_639_1 = _intern_or_none(isolang.pt1)
+        self.iso_639_2b = _intern_or_none(isolang.pt2b)
+        self.iso_639_2t = _intern_or_none(isolang.pt2t)
+        self.iso_639_3 = _intern_or_none(isolang.pt3)
+        self.iso_639_5 = _intern_or_none(isolang.pt5)
         self.english = isolang.name or None
         self.iso_types = [
             part_level
@@ -84,22 +92,24 @@ class Language:
         ]
 
         # update if language has a macro
-        if isolang.macro():
+        if macro := isolang.macro():
             for iso_level in [f"iso_639_{level}" for level in ISO_LEVELS]:
                 if not getattr(self, iso_level):
                     setattr(
                         self,
                         iso_level,
                         # we'll get the pt attr for each iso_xxx
-                        getattr(isolang.macro(), parts_keys_map[iso_level], None)
-                        # we want None if value is empty
-                        or None,
+                        _intern_or_none(
+                            getattr(macro, parts_keys_map[iso_level], None)
+                        ),
                     )
 
         self.native, self.english = self._get_names_from(self.native_query)
 
     def _get_names_from(self, query: str) -> tuple[str, str]:
         """logic to find language names from babel and fallback"""
+        import babel
+
         try:
             query_locale = babel.Locale.parse(query)
             if native_display_name := query_locale.get_display_name():
@@ -127,21 +137,16 @@ class Language:
 
     def todict(self) -> dict[str, str | None | list[str]]:
         return {
-            key.replace("_", "-") if key.startswith("iso") else key: getattr(
-                self, key, None
-            )
-            for key in [
-                "iso_639_1",
-                "iso_639_2b",
-                "iso_639_2t",
-                "iso_639_3",
-                "iso_639_5",
-                "english",
-                "iso_types",
-                "native",
-                "querytype",
-                "query",
-            ]
+            "iso-639-1": self.iso_639_1,
+            "iso-639-2b": self.iso_639_2b,
+            "iso-639-2t": self.iso_639_2t,
+            "iso-639-3": self.iso_639_3,
+            "iso-639-5": self.iso_639_5,
+            "english": self.english,
+            "iso-types": self.iso_types,
+            "native": self.native,
+            "querytype": self.querytype,
+            "query": self.query,
         }
 
     def __repr__(self) -> str:
@@ -1,6 +1,17 @@
 from zimscraperlib.image.conversion import convert_image
-from zimscraperlib.image.optimization import optimize_image
+from zimscraperlib.image.optimization import (
+    optimize_image,
+    optimize_images,
+    optimize_images_iter,
+)
 from zimscraperlib.image.probing import is_valid_image
 from zimscraperlib.image.transformation import resize_image
 
-__all__ = ["convert_image", "is_valid_image", "optimize_image", "resize_image"]
+__all__ = [
+    "convert_image",
+    "is_valid_image",
+    "optimize_image",
+    "optimize_images",
+    "optimize_images_iter",
+    "resize_image",
+]
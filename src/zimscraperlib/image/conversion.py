@@ -1,13 +1,22 @@
 import io
 import pathlib
+from functools import lru_cache
 from typing import Any
 
 import cairosvg.svg  # pyright: ignore[reportMissingTypeStubs]
+from PIL.Image import Resampling
+from PIL.Image import new as pilnew
 from PIL.Image import open as pilopen
 
+try:
+    # optional, much faster SVG renderer
+    import resvg_py  # pyright: ignore[reportMissingImports, reportMissingTypeStubs]
+except ImportError:  # pragma: no cover
+    resvg_py = None
+
 from zimscraperlib.constants import ALPHA_NOT_SUPPORTED
 from zimscraperlib.image.probing import format_for
-from zimscraperlib.image.transformation import resize_image
+from zimscraperlib.image.transformation import resize_image_in_memory
 from zimscraperlib.image.utils import save_image
 
 
@@ -34,8 +43,14 @@ def convert_image(
     if not fmt:
         raise ValueError("Impossible to guess destination image format")
     with pilopen(src) as image:
-        if (image.mode == "RGBA" and fmt in ALPHA_NOT_SUPPORTED) or colorspace:
-            image = image.convert(colorspace or "RGB")  # noqa: PLW2901
+        target_mode = colorspace or (
+            "RGB" if (image.mode == "RGBA" and fmt in ALPHA_NOT_SUPPORTED) else None
+        )
+        if target_mode:
+            # let JPEG decoder output target mode directly when it can (noop otherwise)
+            image.draft(target_mode, None)
+            if image.mode != target_mode:
+                image = image.convert(target_mode)  # noqa: PLW2901
         save_image(image, dst, fmt, **params)
 
 
@@ -49,45 +64,127 @@ def convert_svg2png(
 
     Output width and height might be specified if resize is needed.
     PNG background is transparent.
+
+    SVG is rendered with resvg if resvg_py is installed (except for URLs which are
+    only supported by cairosvg), otherwise with cairosvg.
+
+    Rendering of in-memory SVGs is cached since scrapers often convert the same
+    ones (logos, icons, ...) many times.
     """
-    kwargs: dict[str, Any] = {}
-    if isinstance(src, pathlib.Path):
-        src = str(src)
-    if isinstance(src, str):
-        kwargs["url"] = src
+    if isinstance(src, io.BytesIO):
+        result = _svg_bytes2png(src.getvalue(), width, height)
+    elif resvg_py is not None and isinstance(src, pathlib.Path):
+        result = _render_with_resvg(width, height, svg_path=str(src))
+    else:
+        kwargs = _cairosvg_size_kwargs(width, height)
+        if isinstance(dst, pathlib.Path):
+            cairosvg.svg2png(  # pyright: ignore[reportUnknownMemberType]
+                url=str(src), write_to=str(dst), **kwargs
+            )
+            return
+        result = _render_with_cairosvg(url=str(src), **kwargs)
+
+    if isinstance(dst, pathlib.Path):
+        dst.write_bytes(result)
     else:
-        kwargs["bytestring"] = src.getvalue()
+        dst.write(result)
+
+
+@lru_cache(maxsize=32)
+def _svg_bytes2png(svg: bytes, width: int | None, height: int | None) -> bytes:
+    """PNG bytes of a SVG passed as bytes"""
+    if resvg_py is not None:
+        try:
+            svg_string = svg.decode("utf-8")
+        except UnicodeDecodeError:
+            # gzipped (svgz) or non UTF-8 SVG, only supported by cairosvg
+            pass
+        else:
+            return _render_with_resvg(width, height, svg_string=svg_string)
+    return _render_with_cairosvg(bytestring=svg, **_cairosvg_size_kwargs(width, height))
+
+
+def _render_with_resvg(
+    width: int | None,
+    height: int | None,
+    *,
+    svg_path: str | None = None,
+    svg_string: str | None = None,
+) -> bytes:
+    """PNG bytes of SVG source (svg_path or svg_string) rendered by resvg"""
+    result = resvg_py.svg_to_bytes(  # pyright: ignore[reportOptionalMemberAccess]
+        svg_string=svg_string,
+        svg_path=svg_path,
+        width=width,
+        height=height,
+        # same as cairosvg, needed to convert physical units (pt, mm, ...) to px
+        dpi=96,
+    )
+    if width and height:
+        # resvg fits drawing into requested size while cairosvg renders on a canvas
+        # of exactly this size, drawing being centered
+        return _pad_png(result, width, height)
+    return result
+
+
+def _pad_png(png: bytes, width: int, height: int) -> bytes:
+    """PNG bytes centered on a transparent canvas of requested size"""
+    with pilopen(io.BytesIO(png)) as image:
+        if image.size == (width, height):
+            return png
+        canvas = pilnew("RGBA", (width, height), (0, 0, 0, 0))
+        canvas.paste(
+            image,
+            ((width - image.size[0]) // 2, (height - image.size[1]) // 2),
+        )
+    padded = io.BytesIO()
+    canvas.save(padded, "PNG")
+    return padded.getvalue()
+
+
+def _cairosvg_size_kwargs(width: int | None, height: int | None) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {}
     if width:
         kwargs["output_width"] = width
     if height:
         kwargs["output_height"] = height
-    if isinstance(dst, pathlib.Path):
-        cairosvg.svg2png(  # pyright: ignore[reportUnknownMemberType]
-            write_to=str(dst), **kwargs
-        )
-    else:
-        result = cairosvg.svg2png(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-            **kwargs
-        )
-        if not isinstance(result, bytes):
-            raise Exception(
-                "Unexpected type returned by cairosvg.svg2png"
-            )  # pragma: no cover
-        dst.write(result)
+    return kwargs
+
 
+def _render_with_cairosvg(**kwargs: Any) -> bytes:
+    """PNG bytes of SVG rendered by cairosvg"""
+    result = cairosvg.svg2png(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        **kwargs
+    )
+    if not isinstance(result, bytes):
+        raise Exception(
+            "Unexpected type returned by cairosvg.svg2png"
+        )  # pragma: no cover
+    return result
+
+
+def create_favicon(
+    src: pathlib.Path,
+    dst: pathlib.Path,
+    resample: Resampling = Resampling.BICUBIC,
+) -> None:
+    """generate a squared favicon from a source image
 
-def create_favicon(src: pathlib.Path, dst: pathlib.Path) -> None:
-    """generate a squared favicon from a source image"""
+    resample: Pillow resampling filter used to square the image"""
     if dst.suffix != ".ico":
         raise ValueError("favicon extension must be ICO")
 
-    img = pilopen(src)
-    w, h = img.size
-    # resize image to square first
-    if w != h:
-        size = min([w, h])
-        resized = dst.parent.joinpath(f"{src.stem}.tmp.{src.suffix}")
-        resize_image(src, size, size, resized, "contain")
-        img = pilopen(resized)
-    # now convert to ICO
-    save_image(img, dst, "ICO")
+    with pilopen(src) as img:
+        w, h = img.size
+        # resize image to square first (in memory)
+        if w != h:
+            size = min([w, h])
+            resized = resize_image_in_memory(
+                img, size, size, "contain", resample=resample
+            )
+            # remove alpha layer if not supported and added during resizing
+            if resized.mode == "RGBA" and img.format in ALPHA_NOT_SUPPORTED:
+                resized = resized.convert(img.mode)
+            img = resized  # noqa: PLW2901
+        # now convert to ICO
+        save_image(img, dst, "ICO")
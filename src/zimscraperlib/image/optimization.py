@@ -1,7 +1,7 @@
 """ An image optimization module to optimize the following image formats:
 
     - JPEG (using optimize-images)
-    - PNG (using optimize-images)
+    - PNG (using optimize-images, and optionally oxipng)
     - GIF (using gifsicle with lossy optimization)
     - WebP (using Pillow)
 
@@ -18,25 +18,34 @@
     can still run on default settings which give
       a bit less size than the original images but maintain a high quality. """
 
+import array
+import hashlib
 import io
 import os
 import pathlib
+import shutil
 import subprocess
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache, partial
 
-import piexif  # pyright: ignore[reportMissingTypeStubs]
-from optimize_images.img_aux_processing import (  # pyright: ignore[reportMissingTypeStubs]
-    do_reduce_colors,
-    rebuild_palette,
-)
 from optimize_images.img_aux_processing import (  # pyright: ignore[reportMissingTypeStubs]
     remove_transparency as remove_alpha,
 )
 from optimize_images.img_dynamic_quality import (  # pyright: ignore[reportMissingTypeStubs]
     jpeg_dynamic_quality,
 )
-from PIL import Image
+from PIL import Image, UnidentifiedImageError, features
+
+try:
+    # optional, much stronger PNG optimizer
+    import oxipng  # pyright: ignore[reportMissingImports, reportMissingTypeStubs]
+except ImportError:  # pragma: no cover
+    oxipng = None
 
+from zimscraperlib import logger
 from zimscraperlib.image.conversion import convert_image
 from zimscraperlib.image.probing import format_for
 from zimscraperlib.image.utils import save_image
@@ -45,13 +54,43 @@ from zimscraperlib.image.utils import save_image
 def ensure_matches(
     src: pathlib.Path | io.BytesIO,
     fmt: str,
+    *,
+    known_format: str | None = None,
 ) -> None:
-    """Raise ValueError if src is not of image type `fmt`"""
+    """Raise ValueError if src is not of image type `fmt`
+
+    known_format: src format if already probed by caller, saving a new probe"""
+
+    if known_format == fmt:
+        return
 
     if format_for(src, from_suffix=False) != fmt:
         raise ValueError(f"{src} is not of format {fmt}")
 
 
+def _open_matching(
+    src: pathlib.Path | io.BytesIO,
+    fmt: str,
+    *,
+    known_format: str | None = None,
+) -> Image.Image:
+    """src opened with Pillow, raising ValueError if not of image type `fmt`
+
+    Same check as ensure_matches, using the header of the opened image instead of
+    probing src a second time"""
+
+    try:
+        img = Image.open(src)
+    except UnidentifiedImageError:
+        # not a Pillow format (SVG...): let ensure_matches report it
+        ensure_matches(src, fmt, known_format=known_format)
+        raise
+    if fmt not in (known_format, img.format):
+        img.close()
+        raise ValueError(f"{src} is not of format {fmt}")
+    return img
+
+
 @dataclass
 class OptimizePngOptions:
     """Dataclass holding PNG optimization options
@@ -69,6 +108,9 @@ class OptimizePngOptions:
         background_color: Background color if remove_transparency is True (tuple
             containing RGB values)
             values: (255, 255, 255) | (221, 121, 108) | (XX, YY, ZZ)
+        use_oxipng: Whether to compress with oxipng (much smaller files, requires
+            optional pyoxipng package) when fast_mode is False (boolean)
+            values: True | False
     """
 
     max_colors: int = 256
@@ -76,18 +118,85 @@ class OptimizePngOptions:
     reduce_colors: bool | None = False
     fast_mode: bool | None = True
     remove_transparency: bool | None = False
+    use_oxipng: bool | None = False
 
 
 def optimize_png(
     src: pathlib.Path | io.BytesIO,
     dst: pathlib.Path | io.BytesIO | None = None,
     options: OptimizePngOptions | None = None,
+    *,
+    known_format: str | None = None,
 ) -> pathlib.Path | io.BytesIO:
     """method to optimize PNG files using a pure python external optimizer"""
 
-    ensure_matches(src, "PNG")
+    with _open_matching(src, "PNG", known_format=known_format) as img:
+        return _optimize_png_image(img, dst, options)
+
+
+def _reduce_colors(img: Image.Image, max_colors: int) -> Image.Image:
+    """img reduced to max_colors, in mode P (or unchanged if it cannot be reduced)
+
+    Same as optimize_images' do_reduce_colors, without its colors accounting (two
+    pixel scans) nor its per-pixel Python copy of P images' alpha onto themselves"""
 
-    img = Image.open(src)
+    orig_mode = img.mode
+
+    # intermediate conversion steps when needed
+    if orig_mode in ("CMYK", "YCbCr", "LAB", "HSV"):
+        img = img.convert("RGB")
+    elif orig_mode == "LA":
+        img = img.convert("RGBA")
+
+    if orig_mode in ("RGB", "L"):
+        palette = Image.Palette.ADAPTIVE
+    elif orig_mode == "RGBA":
+        palette = Image.Palette.ADAPTIVE
+        # blend with transparent image using own alpha
+        img = Image.composite(img, Image.new("RGBA", img.size, (0, 0, 0, 0)), img)
+    elif orig_mode == "P":
+        palette = img.getpalette()
+        img = img.convert("RGBA")
+    else:
+        return img
+
+    return img.convert(
+        "P",
+        palette=palette,  # pyright: ignore[reportArgumentType]
+        colors=max_colors,
+    )
+
+
+def _rebuild_palette(img: Image.Image) -> Image.Image:
+    """mode P img with a palette rebuilt from its actual colors
+
+    Same as optimize_images' rebuild_palette (colors in order of first appearance,
+    column by column), without its per-pixel Python loop: colors are read as 32-bit
+    RGBX integers (from the transposed image to keep that order) and deduplicated by
+    dict.fromkeys, both in C"""
+
+    img = img.convert("RGBA")
+    pixels = array.array(
+        "I",
+        img.transpose(Image.Transpose.TRANSPOSE).convert("RGBX").tobytes(),
+    )
+    palette: list[int] = []
+    for color in dict.fromkeys(pixels):
+        # bytes are R, G, B, X in memory, whatever the endianness
+        palette += color.to_bytes(4, sys.byteorder)[:3]
+    return img.convert(
+        "P",
+        palette=palette,  # pyright: ignore[reportArgumentType]
+        colors=len(palette) // 3,
+    )
+
+
+def _optimize_png_image(
+    img: Image.Image,
+    dst: pathlib.Path | io.BytesIO | None = None,
+    options: OptimizePngOptions | None = None,
+) -> pathlib.Path | io.BytesIO:
+    """optimize an already decoded image into a PNG, avoiding a re-decode"""
 
     if options is None:
         options = OptimizePngOptions()
@@ -96,14 +205,28 @@ def optimize_png(
         img = remove_alpha(img, options.background_color)
 
     if options.reduce_colors:
-        img, _, _ = do_reduce_colors(img, options.max_colors)
+        img = _reduce_colors(img, options.max_colors)
 
     if not options.fast_mode and img.mode == "P":
-        img, _ = rebuild_palette(img)
+        img = _rebuild_palette(img)
 
     if dst is None:
         dst = io.BytesIO()
-    img.save(dst, optimize=True, format="PNG")
+    if options.use_oxipng and not options.fast_mode:
+        if oxipng is None:
+            raise ImportError("use_oxipng requires optional pyoxipng package")
+        # oxipng recompresses anyway: let Pillow encode as fast as possible
+        raw = io.BytesIO()
+        img.save(raw, compress_level=1, format="PNG")
+        optimized = oxipng.optimize_from_memory(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            raw.getvalue(), level=2, strip=oxipng.StripChunks.safe()
+        )
+        if isinstance(dst, pathlib.Path):
+            dst.write_bytes(optimized)  # pyright: ignore[reportUnknownArgumentType]
+        else:
+            dst.write(optimized)  # pyright: ignore[reportUnknownArgumentType]
+    else:
+        img.save(dst, optimize=True, format="PNG")
     if not isinstance(dst, pathlib.Path):
         dst.seek(0)
     return dst
@@ -128,70 +251,87 @@ class OptimizeJpgOptions:
     keep_exif: bool | None = True
 
 
+# dynamic JPEG quality per digest of the (400x400) thumbnail it is computed from
+_dynamic_jpeg_qualities: dict[bytes, int] = {}
+_DYNAMIC_JPEG_QUALITIES_MAXSIZE = 1024
+
+
+def _dynamic_jpeg_quality(img: Image.Image) -> int:
+    """jpeg_dynamic_quality of img, memoized for identical images
+
+    quality only depends on the 400x400 thumbnail jpeg_dynamic_quality works on, which
+    is much cheaper to hash than the several JPEG encodings needed to compute it"""
+    photo = img.resize((400, 400))  # pyright: ignore[reportUnknownMemberType]
+    key = hashlib.blake2b(
+        photo.tobytes(), digest_size=16, person=photo.mode.encode("ASCII")
+    ).digest()
+    if (quality := _dynamic_jpeg_qualities.get(key)) is None:
+        # photo is already sized, so it is not resized again
+        quality, _ = jpeg_dynamic_quality(photo)
+        if len(_dynamic_jpeg_qualities) >= _DYNAMIC_JPEG_QUALITIES_MAXSIZE:
+            del _dynamic_jpeg_qualities[next(iter(_dynamic_jpeg_qualities))]
+        _dynamic_jpeg_qualities[key] = quality
+    return quality
+
+
+@lru_cache(maxsize=1)
+def _check_jpeg_codec() -> bool:
+    """whether Pillow uses libjpeg-turbo, warning (once) if it does not"""
+    if features.check_feature("libjpeg_turbo"):
+        return True
+    logger.warning(
+        "Pillow is not built against libjpeg-turbo; JPEG optimization will be slow"
+    )
+    return False
+
+
 def optimize_jpeg(
     src: pathlib.Path | io.BytesIO,
     dst: pathlib.Path | io.BytesIO | None = None,
     options: OptimizeJpgOptions | None = None,
+    *,
+    known_format: str | None = None,
 ) -> pathlib.Path | io.BytesIO:
     """method to optimize JPEG files using a pure python external optimizer"""
 
     if options is None:
         options = OptimizeJpgOptions()
 
-    ensure_matches(src, "JPEG")
+    _check_jpeg_codec()
 
-    img = Image.open(src)
     orig_size = (
         os.path.getsize(src)
         if isinstance(src, pathlib.Path)
         else src.getbuffer().nbytes
     )
 
-    had_exif = False
-    if (
-        not isinstance(src, pathlib.Path)
-        and piexif.load(src.getvalue())[  # pyright: ignore[reportUnknownMemberType]
-            "Exif"
-        ]
-    ) or (
-        isinstance(src, pathlib.Path)
-        and piexif.load(str(src))["Exif"]  # pyright: ignore[reportUnknownMemberType]
-    ):
-        had_exif = True
+    with _open_matching(src, "JPEG", known_format=known_format) as img:
+        # raw EXIF segment, already read by Pillow while parsing JPEG markers on open
+        exif = img.info.get("exif") if options.keep_exif else None
 
-    # only use progressive if file size is bigger
-    use_progressive_jpg = orig_size > 10240  # 10KiB  # noqa: PLR2004
+        # only use progressive if file size is bigger
+        use_progressive_jpg = orig_size > 10240  # 10KiB  # noqa: PLR2004
 
-    if options.fast_mode:
-        quality_setting = options.quality
-    else:
-        quality_setting, _ = jpeg_dynamic_quality(img)
+        if options.fast_mode:
+            quality_setting = options.quality
+        else:
+            quality_setting = _dynamic_jpeg_quality(img)
 
-    if dst is None:
-        dst = io.BytesIO()
+        if dst is None:
+            dst = io.BytesIO()
 
-    img.save(
-        dst,
-        quality=quality_setting,
-        optimize=True,
-        progressive=use_progressive_jpg,
-        format="JPEG",
-    )
+        img.save(
+            dst,
+            quality=quality_setting,
+            optimize=True,
+            progressive=use_progressive_jpg,
+            format="JPEG",
+            **({"exif": exif} if exif else {}),
+        )
 
     if isinstance(dst, io.BytesIO):
         dst.seek(0)
 
-    if options.keep_exif and had_exif:
-        piexif.transplant(  # pyright: ignore[reportUnknownMemberType]
-            exif_src=(
-                str(src.resolve()) if isinstance(src, pathlib.Path) else src.getvalue()
-            ),
-            image=(
-                str(dst.resolve()) if isinstance(dst, pathlib.Path) else dst.getvalue()
-            ),
-            new_file=dst,
-        )
-
     return dst
 
 
@@ -222,36 +362,37 @@ def optimize_webp(
     src: pathlib.Path | io.BytesIO,
     dst: pathlib.Path | io.BytesIO | None = None,
     options: OptimizeWebpOptions | None = None,
+    *,
+    known_format: str | None = None,
 ) -> pathlib.Path | io.BytesIO:
     """method to optimize WebP using Pillow options"""
 
     if options is None:
         options = OptimizeWebpOptions()
 
-    ensure_matches(src, "WEBP")
     params: dict[str, bool | int | None] = {
         "lossless": options.lossless,
         "quality": options.quality,
         "method": options.method,
     }
 
-    webp_image = Image.open(src)
-    if dst is None:
-        dst = io.BytesIO()
-        webp_image.save(dst, format="WEBP", **params)
-        dst.seek(0)
-    else:
-        try:
-            save_image(webp_image, dst, fmt="WEBP", **params)
-        except Exception as exc:  # pragma: no cover
-            if (
-                isinstance(src, pathlib.Path)
-                and isinstance(dst, pathlib.Path)
-                and src.resolve() != dst.resolve()
-                and dst.exists()
-            ):
-                dst.unlink()
-            raise exc
+    with _open_matching(src, "WEBP", known_format=known_format) as webp_image:
+        if dst is None:
+            dst = io.BytesIO()
+            webp_image.save(dst, format="WEBP", **params)
+            dst.seek(0)
+        else:
+            try:
+                save_image(webp_image, dst, fmt="WEBP", **params)
+            except Exception as exc:  # pragma: no cover
+                if (
+                    isinstance(src, pathlib.Path)
+                    and isinstance(dst, pathlib.Path)
+                    and src.resolve() != dst.resolve()
+                    and dst.exists()
+                ):
+                    dst.unlink()
+                raise exc
     return dst
 
 
@@ -284,17 +425,8 @@ class OptimizeGifOptions:
     no_extensions: bool | None = True
 
 
-def optimize_gif(
-    src: pathlib.Path, dst: pathlib.Path, options: OptimizeGifOptions | None = None
-) -> pathlib.Path:
-    """method to optimize GIFs using gifsicle >= 1.92"""
-
-    if options is None:
-        options = OptimizeGifOptions()
-
-    ensure_matches(src, "GIF")
-
-    # use gifsicle
+def _gifsicle_args(options: OptimizeGifOptions) -> list[str]:
+    """gifsicle command (without input) for those options"""
     args = ["/usr/bin/env", "gifsicle"]
     if options.optimize_level:
         args += [f"-O{options.optimize_level}"]
@@ -306,9 +438,48 @@ def optimize_gif(
         args += ["--no-extensions"]
     if options.interlace:
         args += ["--interlace"]
-    args += [str(src)]
-    with open(dst, "w") as out_file:
-        gifsicle = subprocess.run(args, stdout=out_file, check=False)
+    return args
+
+
+def optimize_gif(
+    src: pathlib.Path | io.BytesIO,
+    dst: pathlib.Path | io.BytesIO | None = None,
+    options: OptimizeGifOptions | None = None,
+    *,
+    known_format: str | None = None,
+) -> pathlib.Path | io.BytesIO:
+    """method to optimize GIFs using gifsicle >= 1.92
+
+    in-memory src or dst GIFs are piped through gifsicle"""
+
+    if options is None:
+        options = OptimizeGifOptions()
+
+    ensure_matches(src, "GIF", known_format=known_format)
+
+    if not isinstance(src, pathlib.Path) or not isinstance(dst, pathlib.Path):
+        optimized = _pipe_through_gifsicle(
+            (
+                [*_gifsicle_args(options), str(src)]
+                if isinstance(src, pathlib.Path)
+                else _gifsicle_args(options)
+            ),
+            src=None if isinstance(src, pathlib.Path) else src.getvalue(),
+        )
+        if isinstance(dst, pathlib.Path):
+            dst.write_bytes(optimized)
+            return dst
+        if dst is None:
+            dst = io.BytesIO()
+        dst.write(optimized)
+        dst.seek(0)
+        return dst
+
+    # use gifsicle, letting it write dst itself (it reads src entirely first, so
+    # src and dst can be the same file)
+    gifsicle = subprocess.run(
+        [*_gifsicle_args(options), "--output", str(dst), str(src)], check=False
+    )
 
     # remove dst if gifsicle failed and src is different from dst
     if gifsicle.returncode != 0 and src.resolve() != dst.resolve() and dst.exists():
@@ -319,6 +490,81 @@ def optimize_gif(
     return dst
 
 
+def _pipe_through_gifsicle(args: list[str], src: bytes | None) -> bytes:
+    """gifsicle output for those args, src being fed on its input if passed"""
+    return subprocess.run(args, input=src, stdout=subprocess.PIPE, check=True).stdout
+
+
+def optimize_gif_bytes(
+    src: bytes,
+    options: OptimizeGifOptions | None = None,
+) -> bytes:
+    """optimized GIF bytes of src GIF bytes, using gifsicle >= 1.92
+
+    GIF is piped through gifsicle, without touching the disk"""
+
+    if options is None:
+        options = OptimizeGifOptions()
+
+    ensure_matches(io.BytesIO(src), "GIF")
+
+    return _pipe_through_gifsicle(_gifsicle_args(options), src=src)
+
+
+def optimize_gifs(
+    jobs: Iterable[tuple[pathlib.Path, pathlib.Path]],
+    options: OptimizeGifOptions | None = None,
+    *,
+    max_workers: int | None = None,
+) -> list[pathlib.Path]:
+    """method to optimize many GIFs with few gifsicle >= 1.92 processes
+
+    jobs are (src, dst) tuples ; src is copied to dst which is then optimized
+    in-place using gifsicle batch mode.
+
+    max_workers: number of concurrent gifsicle processes, each handling a share of
+    the jobs (defaults to the number of CPUs)"""
+
+    if options is None:
+        options = OptimizeGifOptions()
+
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    for src, _ in jobs:
+        ensure_matches(src, "GIF")
+
+    copies: list[pathlib.Path] = []
+    for src, dst in jobs:
+        if not (dst.exists() and src.samefile(dst)):
+            shutil.copyfile(src, dst)
+            copies.append(dst)
+
+    dsts = [dst for _, dst in jobs]
+    nb_shards = max(1, min(max_workers or os.cpu_count() or 1, len(dsts)))
+    processes = [
+        subprocess.Popen(
+            [*_gifsicle_args(options), "--batch", *[str(dst) for dst in shard]]
+        )
+        for shard in (dsts[index::nb_shards] for index in range(nb_shards))
+    ]
+    returncodes = [process.wait() for process in processes]
+
+    # remove copies if gifsicle failed
+    if any(returncodes):
+        for dst in copies:  # pragma: no cover
+            dst.unlink(missing_ok=True)
+
+    # raise error if unsuccessful
+    for process, returncode in zip(processes, returncodes, strict=True):
+        if returncode:
+            raise subprocess.CalledProcessError(
+                returncode, process.args
+            )  # pragma: no cover
+    return dsts
+
+
 @dataclass
 class OptimizeOptions:
     """Dataclass holding optimization options for all supported formats"""
@@ -345,6 +591,16 @@ class OptimizeOptions:
         )
 
 
+# optimizer and its OptimizeOptions attribute, per (lowercase) format
+_OPTIMIZERS: dict[str, tuple[Callable[..., pathlib.Path | io.BytesIO], str]] = {
+    "jpg": (optimize_jpeg, "jpg"),
+    "jpeg": (optimize_jpeg, "jpg"),
+    "gif": (optimize_gif, "gif"),
+    "png": (optimize_png, "png"),
+    "webp": (optimize_webp, "webp"),
+}
+
+
 def optimize_image(
     src: pathlib.Path,
     dst: pathlib.Path,
@@ -374,28 +630,135 @@ def optimize_image(
         raise ValueError("Impossible to guess format from src image")
     if dst_format is None:
         raise ValueError("Impossible to guess format from dst image")
-    # if requested, convert src to requested format into dst path
+    # if requested, convert src to requested format before optimizing
+    # PNG optimizer works on a decoded image: when converting to PNG, feed it the
+    # decoded src instead of writing then decoding an intermediate PNG
+    convert_in_memory = False
+    src_img: pathlib.Path | io.BytesIO = pathlib.Path(src)
     if convert and src_format != dst_format:
         src_format = dst_format = convert if isinstance(convert, str) else dst_format
-        convert_image(src, dst, fmt=src_format)
-        src_img = pathlib.Path(dst)
-    else:
-        src_img = pathlib.Path(src)
-
+        if src_format.upper() == "PNG":
+            convert_in_memory = True
+        elif src_format.upper() in ("JPEG", "WEBP"):
+            # intermediate image is only read by the optimizer: keep it in memory
+            src_img = io.BytesIO()
+            convert_image(src, src_img, fmt=src_format)
+            src_img.seek(0)
+        else:
+            # gifsicle (and unsupported formats) need intermediate image on dst path
+            convert_image(src, dst, fmt=src_format)
+            src_img = pathlib.Path(dst)
+
+    # format is already known, no need for optimizers to probe src_img again
+    known_format = src_format
     src_format = src_format.lower()
-    if src_format in ("jpg", "jpeg"):
-        optimize_jpeg(src=src_img, dst=dst, options=options.jpg)
-    elif src_format == "gif":
-        optimize_gif(src=src_img, dst=dst, options=options.gif)
-    elif src_format == "png":
-        optimize_png(src=src_img, dst=dst, options=options.png)
-    elif src_format == "webp":
-        optimize_webp(src=src_img, dst=dst, options=options.webp)
+    if convert_in_memory:
+        with Image.open(src) as img:
+            _optimize_png_image(img, dst=dst, options=options.png)
+    elif src_format in _OPTIMIZERS:
+        optimizer, options_attr = _OPTIMIZERS[src_format]
+        optimizer(
+            src=src_img,
+            dst=dst,
+            options=getattr(options, options_attr),
+            known_format=known_format,
+        )
     else:
         raise NotImplementedError(
             f"Image format '{src_format}' cannot yet be optimized"
         )
 
     # delete src image if requested
-    if delete_src and src.exists() and src.resolve() != dst.resolve():
+    # dst has just been written: compare inodes, cheaper than resolving both paths
+    if delete_src and src.exists() and not src.samefile(dst):
         src.unlink()
+
+
+def _optimize_image_job(
+    job: tuple[pathlib.Path, pathlib.Path],
+    options: OptimizeOptions | None,
+    *,
+    delete_src: bool | None,
+    convert: bool | str | None,
+) -> None:
+    """optimize_image for a (src, dst) tuple, to be run in a worker process"""
+    src, dst = job
+    optimize_image(src, dst, options, delete_src=delete_src, convert=convert)
+
+
+def _pool_size(max_workers: int | None) -> int | None:
+    """max_workers, or ZIMSCRAPERLIB_OPT_WORKERS if not set (None: number of CPUs)"""
+    if max_workers is None and (env_workers := os.getenv("ZIMSCRAPERLIB_OPT_WORKERS")):
+        return int(env_workers)
+    return max_workers
+
+
+def optimize_images(
+    jobs: Iterable[tuple[pathlib.Path, pathlib.Path]],
+    options: OptimizeOptions | None = None,
+    *,
+    delete_src: bool | None = False,
+    convert: bool | str | None = False,
+    max_workers: int | None = None,
+    chunksize: int = 8,
+) -> None:
+    """Optimize a batch of images in parallel, using a pool of processes
+
+    Arguments:
+        jobs: (src, dst) tuples, each passed to optimize_image
+        options, delete_src, convert: passed to optimize_image for every job
+        max_workers: number of processes to use (defaults to
+            ZIMSCRAPERLIB_OPT_WORKERS environment variable or number of CPUs)
+        chunksize: number of jobs sent at once to a process, reducing IPC overhead
+
+    First error encountered (in jobs order) is raised once all jobs are done"""
+
+    with ProcessPoolExecutor(max_workers=_pool_size(max_workers)) as executor:
+        for _ in executor.map(
+            partial(
+                _optimize_image_job,
+                options=options,
+                delete_src=delete_src,
+                convert=convert,
+            ),
+            jobs,
+            chunksize=chunksize,
+        ):
+            pass
+
+
+def optimize_images_iter(
+    jobs: Iterable[tuple[pathlib.Path, pathlib.Path]],
+    options: OptimizeOptions | None = None,
+    *,
+    delete_src: bool | None = False,
+    convert: bool | str | None = False,
+    max_workers: int | None = None,
+) -> Iterator[tuple[pathlib.Path, pathlib.Path]]:
+    """Optimize a batch of images in parallel, yielding jobs as they are done
+
+    Same as optimize_images but (src, dst) tuples are yielded in completion order,
+    so that caller can consume optimized images (add them to a ZIM, upload them...)
+    while others are still being optimized.
+
+    An error is raised as soon as its job is done ; pending jobs are then cancelled"""
+
+    with ProcessPoolExecutor(max_workers=_pool_size(max_workers)) as executor:
+        futures = {
+            executor.submit(
+                _optimize_image_job,
+                job,
+                options,
+                delete_src=delete_src,
+                convert=convert,
+            ): job
+            for job in jobs
+        }
+        try:
+            for future in as_completed(futures):
+                future.result()
+                yield futures[future]
+        finally:
+            # noop for done jobs ; avoids waiting for pending ones on error/close
+            for future in futures:
+                future.cancel()
@@ -82,6 +82,19 @@ def format_for(
             "Cannot guess image format from file suffix when byte array is passed"
         )
 
+    return _format_for_suffix(src.suffix)
+
+
+# Pillow format of already resolved suffixes ; unknown suffixes are not cached since
+# plugins can register new extensions later on (pillow_heif for instance)
+_suffix_formats: dict[str, str] = {}
+
+
+def _format_for_suffix(suffix: str) -> str | None:
+    """Pillow format for a file suffix"""
+    if (fmt := _suffix_formats.get(suffix)) is not None:
+        return fmt
+
     from PIL.Image import EXTENSION as PIL_FMT_EXTENSION
     from PIL.Image import init as init_pil
 
@@ -89,7 +102,10 @@ def format_for(
 
     known_extensions = {".svg": "SVG"}
     known_extensions.update(PIL_FMT_EXTENSION)
-    return known_extensions[src.suffix] if src.suffix in known_extensions else None
+    fmt = known_extensions.get(suffix)
+    if fmt is not None:
+        _suffix_formats[suffix] = fmt
+    return fmt
 
 
 def is_valid_image(
@@ -1,3 +1,4 @@
+import sys
 from typing import Any
 from unittest.mock import Mock
 
@@ -9,6 +10,7 @@ from zimscraperlib.i18n import (
     find_language_names,
     get_language,
     get_language_or_none,
+    is_valid_iso_639_3,
 )
 
 
@@ -374,3 +376,25 @@ def test_lang_repr(query: str, expected: str):
 )
 def test_lang_str(query: str, expected: str):
     assert f"{Language(query)}" == expected
+
+
+@pytest.mark.parametrize(
+    "code,expected",
+    [
+        ("fra", True),
+        ("ara", True),
+        ("fr", False),
+        ("fre", False),
+        ("French", False),
+        ("zzz", False),
+    ],
+)
+def test_is_valid_iso_639_3(code: str, *, expected: bool):
+    assert is_valid_iso_639_3(code) is expected
+
+
+def test_lang_codes_interned():
+    lang = Language("fr")
+    assert lang.iso_639_1 is sys.intern("fr")
+    assert lang.iso_639_3 is sys.intern("fra")
+    assert lang.iso_639_5 is None
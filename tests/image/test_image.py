@@ -1,3 +1,4 @@
+import gzip
 import inspect
 import io
 import os
@@ -6,15 +7,20 @@ import re
 import shutil
 from dataclasses import asdict, is_dataclass
 from typing import Any
+from unittest.mock import Mock
 
 import piexif  # pyright: ignore[reportMissingTypeStubs]
 import pytest
-from PIL import Image
-from resizeimage.imageexceptions import (  # pyright: ignore[reportMissingTypeStubs]
-    ImageSizeError,
+from optimize_images.img_aux_processing import (  # pyright: ignore[reportMissingTypeStubs]
+    do_reduce_colors,
+    rebuild_palette,
+)
+from optimize_images.img_dynamic_quality import (  # pyright: ignore[reportMissingTypeStubs]
+    jpeg_dynamic_quality,
 )
+from PIL import Image
 
-from zimscraperlib.image import presets
+from zimscraperlib.image import conversion, optimization, presets, transformation
 from zimscraperlib.image.conversion import (
     convert_image,
     convert_svg2png,
@@ -28,7 +34,11 @@ from zimscraperlib.image.optimization import (
     OptimizeWebpOptions,
     ensure_matches,
     optimize_gif,
+    optimize_gif_bytes,
+    optimize_gifs,
     optimize_image,
+    optimize_images,
+    optimize_images_iter,
     optimize_jpeg,
     optimize_png,
     optimize_webp,
@@ -53,7 +63,11 @@ from zimscraperlib.image.probing import (
     is_hex_color,
     is_valid_image,
 )
-from zimscraperlib.image.transformation import resize_image
+from zimscraperlib.image.transformation import (
+    ImageSizeError,
+    resize_image,
+    resize_image_in_memory,
+)
 from zimscraperlib.image.utils import save_image
 
 ALL_PRESETS = [
@@ -206,6 +220,110 @@ def test_resize_width(
     assert tw == width
 
 
+@pytest.mark.parametrize(
+    "resample",
+    [Image.Resampling.BOX, Image.Resampling.BICUBIC, Image.Resampling.LANCZOS],
+)
+@pytest.mark.parametrize(
+    "method",
+    ["width", "cover", "crop"],
+)
+def test_resize_resample(
+    png_image: pathlib.Path,
+    tmp_path: pathlib.Path,
+    method: str,
+    resample: Image.Resampling,
+):
+    dst = tmp_path / "out.png"
+
+    width, height = 100, 50
+    resize_image(png_image, width, height, dst=dst, method=method, resample=resample)
+    tw, _ = get_image_size(dst)
+    assert tw == width
+
+
+@pytest.mark.parametrize("method", ["width", "height", "thumbnail", "cover", "contain"])
+def test_resize_resample_changes_pixels(png_image: pathlib.Path, method: str):
+    resized: dict[Image.Resampling, bytes] = {}
+    for resample in (Image.Resampling.NEAREST, Image.Resampling.LANCZOS):
+        dst = io.BytesIO()
+        resize_image(png_image, 20, 20, dst=dst, method=method, resample=resample)
+        with Image.open(dst) as image:
+            resized[resample] = image.tobytes()
+    # filter is actually used to resample, not ignored
+    assert resized[Image.Resampling.NEAREST] != resized[Image.Resampling.LANCZOS]
+
+
+@pytest.mark.parametrize("method", ["width", "height", "cover"])
+def test_resize_resample_nearest_validates(png_image: pathlib.Path, method: str):
+    with pytest.raises(ImageSizeError):
+        resize_image(
+            png_image,
+            5000,
+            5000,
+            dst=io.BytesIO(),
+            method=method,
+            allow_upscaling=False,
+            resample=Image.Resampling.NEAREST,
+        )
+
+
+@pytest.mark.parametrize(
+    "method,width,height,exp_decoded_size",
+    [
+        ("thumbnail", 100, 100, (256, 256)),
+        ("cover", 100, 50, (256, 256)),
+        ("width", 200, None, (512, 512)),
+        ("height", 1, 400, (1024, 1024)),
+        ("crop", 100, 100, (1024, 1024)),
+    ],
+)
+def test_resize_jpeg_draft(
+    square_jpg_image: pathlib.Path,
+    mocker: Mock,
+    method: str,
+    width: int,
+    height: int | None,
+    exp_decoded_size: tuple[int, int],
+):
+    resize = mocker.spy(transformation, "resize_image_in_memory")
+    dst = io.BytesIO()
+    resize_image(square_jpg_image, width, height, dst=dst, method=method)
+    # JPEG was downscaled by decoder before being resized
+    assert resize.call_args.args[0].size == exp_decoded_size
+    tw, th = get_image_size(dst)
+    if method != "height":
+        assert tw == width
+    if height:
+        assert th == height
+
+
+@pytest.mark.parametrize(
+    "method,width,height",
+    [
+        ("thumbnail", 100, 100),
+        ("contain", 100, 100),
+        ("cover", 100, 50),
+        ("width", 200, None),
+        ("height", 1, 400),
+    ],
+)
+def test_resize_reduce(
+    square_png_image: pathlib.Path,
+    tmp_path: pathlib.Path,
+    method: str,
+    width: int,
+    height: int | None,
+):
+    dst = tmp_path / "out.png"
+    resize_image(square_png_image, width, height, dst=dst, method=method)
+    tw, th = get_image_size(dst)
+    if method != "height":
+        assert tw == width
+    if height:
+        assert th == height
+
+
 @pytest.mark.parametrize(
     "fmt",
     ["png", "jpg"],
@@ -306,9 +424,65 @@ def test_resize_small_image_error(
         )
 
 
+@pytest.mark.parametrize("method", ["width", "height", "crop"])
+def test_resize_small_image_error_methods(png_image: pathlib.Path, method: str):
+    with Image.open(png_image) as image:
+        with pytest.raises(ImageSizeError, match="Image is too small"):
+            resize_image_in_memory(
+                image, 5000, 5000, method=method, allow_upscaling=False
+            )
+
+
+@pytest.mark.parametrize(
+    "method,height,message",
+    [
+        ("unknown", 50, "method argument should be one of"),
+        ("cover", None, "height is required for cover method"),
+    ],
+)
+def test_resize_bad_arguments(
+    png_image: pathlib.Path, method: str, height: int | None, message: str
+):
+    with Image.open(png_image) as image:
+        with pytest.raises(ValueError, match=message):
+            resize_image_in_memory(image, 50, height, method=method)
+
+
+@pytest.mark.parametrize(
+    "method", ["width", "height", "thumbnail", "contain", "cover", "crop"]
+)
+@pytest.mark.parametrize("fmt", ["png", "jpg"])
+def test_resize_in_memory_keeps_source(
+    png_image: pathlib.Path,
+    square_jpg_image: pathlib.Path,
+    fmt: str,
+    method: str,
+):
+    src = png_image if fmt == "png" else square_jpg_image
+    with Image.open(src) as image:
+        size = image.size
+        # image is not loaded yet so that JPEG decoder could still be drafted
+        resized = resize_image_in_memory(image, 20, 20, method=method)
+        assert resized is not image
+        assert image.size == size
+        with Image.open(src) as pristine:
+            assert image.tobytes() == pristine.tobytes()
+        # caller can still resize its image to a bigger size afterwards
+        resized = resize_image_in_memory(
+            image, 600, 600, method="thumbnail", allow_upscaling=False
+        )
+        assert max(resized.size) == min(600, max(size))
+
+
 @pytest.mark.parametrize(
     "src_fmt,dst_fmt,colorspace",
-    [("png", "JPEG", "RGB"), ("png", "BMP", None), ("jpg", "JPEG", "CMYK")],
+    [
+        ("png", "JPEG", "RGB"),
+        ("png", "BMP", None),
+        ("jpg", "JPEG", "CMYK"),
+        ("jpg", "JPEG", "RGB"),
+        ("jpg", "JPEG", "L"),
+    ],
 )
 def test_change_image_format(
     png_image: pathlib.Path,
@@ -375,6 +549,17 @@ def test_convert_path_src_io_dst(png_image: pathlib.Path):
     assert dst_image.format == "PNG"
 
 
+@pytest.fixture(params=["cairosvg", "resvg"])
+def svg_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    # do not reuse in-memory SVG renderings from the other backend
+    conversion._svg_bytes2png.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    if request.param == "cairosvg":
+        monkeypatch.setattr(conversion, "resvg_py", None)
+    elif conversion.resvg_py is None:  # pyright: ignore[reportUnnecessaryComparison]
+        pytest.skip("resvg_py is not installed")
+
+
+@pytest.mark.usefixtures("svg_backend")
 def test_convert_svg_io_src_path_dst(svg_image: pathlib.Path, tmp_path: pathlib.Path):
     src = io.BytesIO(svg_image.read_bytes())
     dst = tmp_path / "test.png"
@@ -383,6 +568,7 @@ def test_convert_svg_io_src_path_dst(svg_image: pathlib.Path, tmp_path: pathlib.
     assert dst_image.format == "PNG"
 
 
+@pytest.mark.usefixtures("svg_backend")
 def test_convert_svg_io_src_io_dst(svg_image: pathlib.Path):
     src = io.BytesIO(svg_image.read_bytes())
     dst = io.BytesIO()
@@ -391,6 +577,38 @@ def test_convert_svg_io_src_io_dst(svg_image: pathlib.Path):
     assert dst_image.format == "PNG"
 
 
+@pytest.mark.parametrize("encoding", ["svgz", "latin1"])
+def test_convert_svg_io_src_not_utf8(
+    svg_image: pathlib.Path, monkeypatch: pytest.MonkeyPatch, encoding: str
+):
+    conversion._svg_bytes2png.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    render = Mock(return_value=b"png")
+    monkeypatch.setattr(conversion, "_render_with_cairosvg", render)
+    src = svg_image.read_bytes()
+    if encoding == "svgz":
+        src = gzip.compress(src)
+    else:
+        src = src.replace(b"<svg", b"<!-- \xe9 --><svg", 1)
+    dst = io.BytesIO()
+    convert_svg2png(io.BytesIO(src), dst, width=96)
+    # resvg only accepts UTF-8 strings, cairosvg is used instead
+    render.assert_called_once_with(bytestring=src, output_width=96)
+    assert dst.getvalue() == b"png"
+
+
+@pytest.mark.usefixtures("svg_backend")
+def test_convert_svg_io_src_cached(svg_image: pathlib.Path):
+    first, second = io.BytesIO(), io.BytesIO()
+    convert_svg2png(io.BytesIO(svg_image.read_bytes()), first, width=96)
+    convert_svg2png(io.BytesIO(svg_image.read_bytes()), second, width=96)
+    assert (
+        conversion._svg_bytes2png.cache_info().hits  # pyright: ignore[reportPrivateUsage]
+        == 1
+    )
+    assert first.getvalue() == second.getvalue()
+
+
+@pytest.mark.usefixtures("svg_backend")
 def test_convert_svg_path_src_path_dst(svg_image: pathlib.Path, tmp_path: pathlib.Path):
     src = svg_image
     dst = tmp_path / "test.png"
@@ -401,6 +619,7 @@ def test_convert_svg_path_src_path_dst(svg_image: pathlib.Path, tmp_path: pathli
     assert dst_image.height == 96
 
 
+@pytest.mark.usefixtures("svg_backend")
 def test_convert_svg_path_src_io_dst(svg_image: pathlib.Path):
     src = svg_image
     dst = io.BytesIO()
@@ -411,6 +630,21 @@ def test_convert_svg_path_src_io_dst(svg_image: pathlib.Path):
     assert dst_image.height == 96
 
 
+@pytest.mark.usefixtures("svg_backend")
+@pytest.mark.parametrize("as_bytes", [False, True])
+@pytest.mark.parametrize("width,height", [(96, 48), (48, 96)])
+def test_convert_svg_non_square(
+    svg_image: pathlib.Path, width: int, height: int, *, as_bytes: bool
+):
+    src = io.BytesIO(svg_image.read_bytes()) if as_bytes else svg_image
+    dst = io.BytesIO()
+    convert_svg2png(src, dst, width=width, height=height)
+    dst_image = Image.open(dst)
+    assert dst_image.size == (width, height)
+    # drawing is centered on a transparent canvas
+    assert dst_image.convert("RGBA").getpixel((0, 0)) == (0, 0, 0, 0)
+
+
 @pytest.mark.parametrize(
     "fmt,exp_size",
     [("png", 128), ("jpg", 128)],
@@ -429,6 +663,8 @@ def test_create_favicon(
     im = Image.open(dst)
     assert im.format == "ICO"
     assert im.size == (exp_size, exp_size)
+    # no intermediate file left behind
+    assert list(dst.parent.glob("*.tmp.*")) == []
 
 
 @pytest.mark.parametrize(
@@ -546,6 +782,82 @@ def test_optimize_image_allow_convert(png_image: pathlib.Path, tmp_path: pathlib
     assert dst.exists() and os.path.getsize(dst) > 0
 
 
+@pytest.mark.parametrize("suffix", ["jpg", "webp"])
+def test_optimize_image_convert_in_memory(
+    png_image: pathlib.Path, tmp_path: pathlib.Path, mocker: Mock, suffix: str
+):
+    spy = mocker.spy(optimization, "convert_image")
+    dst = tmp_path / f"out.{suffix}"
+    optimize_image(png_image, dst, convert=True)
+    # converted image went straight to optimizer, without an intermediate file
+    assert isinstance(spy.call_args.args[1], io.BytesIO)
+    assert format_for(dst, from_suffix=False) == format_for(dst)
+
+
+def test_optimize_image_allow_convert_to_png(
+    jpg_image: pathlib.Path, tmp_path: pathlib.Path
+):
+    shutil.copy(jpg_image, tmp_path)
+    src = tmp_path / jpg_image.name
+    dst = tmp_path / "out.png"
+    optimize_image(src, dst, delete_src=True, convert=True)
+    assert not src.exists()
+    assert format_for(dst, from_suffix=False) == "PNG"
+
+
+def test_optimize_images(
+    png_image: pathlib.Path, jpg_image: pathlib.Path, tmp_path: pathlib.Path
+):
+    jobs = [
+        (png_image, tmp_path / "out.png"),
+        (jpg_image, tmp_path / "out.jpg"),
+        (png_image, tmp_path / "out.webp"),
+    ]
+    optimize_images(jobs, convert=True, max_workers=2, chunksize=1)
+    for src, dst in jobs:
+        assert dst.exists()
+        assert format_for(dst, from_suffix=False) == format_for(dst)
+        assert src.exists()
+
+
+def test_optimize_images_iter(
+    png_image: pathlib.Path, jpg_image: pathlib.Path, tmp_path: pathlib.Path
+):
+    jobs = [
+        (png_image, tmp_path / "out.png"),
+        (jpg_image, tmp_path / "out.jpg"),
+        (png_image, tmp_path / "out.webp"),
+    ]
+    for src, dst in optimize_images_iter(jobs, convert=True, max_workers=2):
+        # each image is ready as soon as yielded
+        assert (src, dst) in jobs
+        assert format_for(dst, from_suffix=False) == format_for(dst)
+    assert all(dst.exists() for _, dst in jobs)
+
+
+def test_optimize_images_iter_error(png_image: pathlib.Path, tmp_path: pathlib.Path):
+    with pytest.raises(ValueError, match="Impossible to guess format from dst image"):
+        list(optimize_images_iter([(png_image, tmp_path / "out.raster")]))
+
+
+def test_optimize_images_env_workers(
+    png_image: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: Mock,
+):
+    monkeypatch.setenv("ZIMSCRAPERLIB_OPT_WORKERS", "1")
+    executor = mocker.spy(optimization, "ProcessPoolExecutor")
+    optimize_images([(png_image, tmp_path / "out.png")])
+    executor.assert_called_once_with(max_workers=1)
+    assert (tmp_path / "out.png").exists()
+
+
+def test_optimize_images_error(png_image: pathlib.Path, tmp_path: pathlib.Path):
+    with pytest.raises(ValueError, match="Impossible to guess format from dst image"):
+        optimize_images([(png_image, tmp_path / "out.raster")], max_workers=1)
+
+
 def test_optimize_image_bad_dst(png_image: pathlib.Path, tmp_path: pathlib.Path):
     shutil.copy(png_image, tmp_path)
     src = tmp_path / png_image.name
@@ -729,6 +1041,61 @@ def test_image_preset_png(
     assert dst_bytes.getbuffer().nbytes < byte_stream.getbuffer().nbytes
 
 
+@pytest.mark.parametrize("fast_mode", [True, False])
+def test_optimize_png_oxipng(png_image: pathlib.Path, *, fast_mode: bool):
+    pytest.importorskip("oxipng")
+    src = io.BytesIO(png_image.read_bytes())
+    pillow = optimize_png(src, options=OptimizePngOptions(fast_mode=fast_mode))
+    oxipng = optimize_png(
+        src, options=OptimizePngOptions(fast_mode=fast_mode, use_oxipng=True)
+    )
+    assert isinstance(pillow, io.BytesIO)
+    assert isinstance(oxipng, io.BytesIO)
+    if fast_mode:
+        # oxipng is never used in fast mode
+        assert oxipng.getvalue() == pillow.getvalue()
+    else:
+        assert len(oxipng.getvalue()) < len(pillow.getvalue())
+    with Image.open(oxipng) as optimized, Image.open(pillow) as reference:
+        assert optimized.tobytes() == reference.tobytes()
+
+
+def test_optimize_png_oxipng_missing(
+    png_image: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(optimization, "oxipng", None)
+    with pytest.raises(ImportError, match="requires optional pyoxipng"):
+        optimize_png(
+            png_image,
+            io.BytesIO(),
+            options=OptimizePngOptions(fast_mode=False, use_oxipng=True),
+        )
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "LA", "P", "CMYK", "1"])
+def test_reduce_colors(png_image: pathlib.Path, mode: str):
+    with Image.open(png_image) as img:
+        src = img.convert(mode)
+    expected, _, _ = do_reduce_colors(src.copy(), 64)
+    reduced = optimization._reduce_colors(  # pyright: ignore[reportPrivateUsage]
+        src, 64
+    )
+    assert reduced.mode == expected.mode
+    assert reduced.getpalette() == expected.getpalette()
+    assert reduced.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("colors", [2, 16, 256])
+def test_rebuild_palette(png_image: pathlib.Path, colors: int):
+    with Image.open(png_image) as img:
+        src = img.convert("P", palette=Image.Palette.ADAPTIVE, colors=colors)
+    expected, _ = rebuild_palette(src.copy())
+    rebuilt = optimization._rebuild_palette(src)  # pyright: ignore[reportPrivateUsage]
+    assert rebuilt.mode == expected.mode
+    assert rebuilt.getpalette() == expected.getpalette()
+    assert rebuilt.tobytes() == expected.tobytes()
+
+
 @pytest.mark.parametrize(
     "preset,expected_version,options",
     [
@@ -830,6 +1197,24 @@ def test_jpeg_exif_preserve(jpg_exif_image: pathlib.Path, tmp_path: pathlib.Path
     )
 
 
+def test_jpeg_exif_drop(jpg_exif_image: pathlib.Path, tmp_path: pathlib.Path):
+    dst = tmp_path / "out.jpg"
+    optimize_jpeg(
+        src=jpg_exif_image, dst=dst, options=OptimizeJpgOptions(keep_exif=False)
+    )
+    assert not piexif.load(str(dst))["Exif"]  # pyright: ignore[reportUnknownMemberType]
+
+
+def test_jpeg_codec_warning(mocker: Mock):
+    optimization._check_jpeg_codec.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    mocker.patch.object(optimization.features, "check_feature", return_value=False)
+    warning = mocker.patch.object(optimization.logger, "warning")
+    assert not optimization._check_jpeg_codec()  # pyright: ignore[reportPrivateUsage]
+    assert not optimization._check_jpeg_codec()  # pyright: ignore[reportPrivateUsage]
+    warning.assert_called_once()
+    optimization._check_jpeg_codec.cache_clear()  # pyright: ignore[reportPrivateUsage]
+
+
 def test_dynamic_jpeg_quality(jpg_image: pathlib.Path, tmp_path: pathlib.Path):
     # check optimization without fast mode
     dst = tmp_path / "out.jpg"
@@ -837,11 +1222,41 @@ def test_dynamic_jpeg_quality(jpg_image: pathlib.Path, tmp_path: pathlib.Path):
     assert os.path.getsize(dst) < os.path.getsize(jpg_image)
 
 
+def test_dynamic_jpeg_quality_memoized(
+    jpg_image: pathlib.Path, tmp_path: pathlib.Path, mocker: Mock
+):
+    optimization._dynamic_jpeg_qualities.clear()  # pyright: ignore[reportPrivateUsage]
+    with Image.open(jpg_image) as img:
+        expected, _ = jpeg_dynamic_quality(img)
+    spy = mocker.spy(optimization, "jpeg_dynamic_quality")
+    with Image.open(jpg_image) as img:
+        assert (
+            optimization._dynamic_jpeg_quality(  # pyright: ignore[reportPrivateUsage]
+                img
+            )
+            == expected
+        )
+    optimize_jpeg(
+        src=jpg_image,
+        dst=tmp_path / "out.jpg",
+        options=OptimizeJpgOptions(fast_mode=False),
+    )
+    spy.assert_called_once()
+
+
 def test_ensure_matches(webp_image: pathlib.Path):
     with pytest.raises(ValueError, match=re.escape("is not of format")):
         ensure_matches(webp_image, "PNG")
 
 
+def test_ensure_matches_known_format(webp_image: pathlib.Path):
+    # format is not probed again when caller already knows it
+    ensure_matches(webp_image, "PNG", known_format="PNG")
+    # but it is when known format does not match
+    with pytest.raises(ValueError, match=re.escape("is not of format")):
+        ensure_matches(webp_image, "PNG", known_format="WEBP")
+
+
 @pytest.mark.parametrize(
     "fmt,expected",
     [("png", "PNG"), ("jpg", "JPEG"), ("gif", "GIF"), ("webp", "WEBP"), ("svg", "SVG")],
@@ -920,6 +1335,17 @@ def test_format_for_real_images_content_bytes(
     assert format_for(io.BytesIO(src.read_bytes()), from_suffix=False) == expected
 
 
+def test_format_for_svg_bytes_long_prolog(svg_image: pathlib.Path):
+    # SVG root element is far from start of content
+    svg = (
+        b'<?xml version="1.0"?>\n<!-- '
+        + b"x" * 3000
+        + b" -->\n"
+        + svg_image.read_bytes()
+    )
+    assert format_for(io.BytesIO(svg), from_suffix=False) == "SVG"
+
+
 @pytest.mark.parametrize(
     "src,expected",
     [
@@ -935,6 +1361,14 @@ def test_format_for_from_suffix(src: str, expected: str):
     assert format_for(src=pathlib.Path(src), from_suffix=True) == expected
 
 
+def test_format_for_suffix_registered_later(monkeypatch: pytest.MonkeyPatch):
+    src = pathlib.Path("image.zzpng")
+    assert format_for(src) is None
+    # like a Pillow plugin registering its extensions once imported
+    monkeypatch.setitem(Image.EXTENSION, ".zzpng", "PNG")
+    assert format_for(src) == "PNG"
+
+
 def test_format_for_cannot_use_suffix_with_byte_array():
     with pytest.raises(
         ValueError,
@@ -950,6 +1384,33 @@ def test_wrong_extension_optim(tmp_path: pathlib.Path, png_image: pathlib.Path):
         optimize_jpeg(dst, dst)
 
 
+def test_optimize_svg_not_png(svg_image: pathlib.Path, tmp_path: pathlib.Path):
+    with pytest.raises(ValueError, match=re.escape("is not of format PNG")):
+        optimize_png(svg_image, tmp_path / "out.png")
+
+
+@pytest.mark.parametrize(
+    "optimizer,fixture",
+    [
+        (optimize_png, "png_image"),
+        (optimize_jpeg, "jpg_image"),
+        (optimize_webp, "webp_image"),
+    ],
+)
+def test_optimizers_open_src_once(
+    request: pytest.FixtureRequest,
+    tmp_path: pathlib.Path,
+    mocker: Mock,
+    optimizer: Any,
+    fixture: str,
+):
+    src: pathlib.Path = request.getfixturevalue(fixture)
+    # format is checked on the opened image, without a separate probe
+    probe = mocker.spy(optimization, "format_for")
+    optimizer(src, tmp_path / f"out{src.suffix}")
+    probe.assert_not_called()
+
+
 def test_is_valid_image(
     png_image: pathlib.Path,
     png_image2: pathlib.Path,
@@ -989,6 +1450,69 @@ def test_optimize_gif_no_interlace(gif_image: pathlib.Path, tmp_path: pathlib.Pa
     )
 
 
+@pytest.mark.parametrize(
+    "src_in_memory,dst_kind",
+    [(True, "none"), (True, "path"), (False, "bytesio"), (True, "bytesio")],
+)
+def test_optimize_gif_in_memory(
+    gif_image: pathlib.Path,
+    tmp_path: pathlib.Path,
+    *,
+    src_in_memory: bool,
+    dst_kind: str,
+):
+    src = io.BytesIO(gif_image.read_bytes()) if src_in_memory else gif_image
+    dst = {
+        "none": None,
+        "path": tmp_path / "out.gif",
+        "bytesio": io.BytesIO(),
+    }[dst_kind]
+    result = optimize_gif(src, dst)
+    if dst is not None:
+        assert result is dst
+    if isinstance(result, pathlib.Path):
+        result = io.BytesIO(result.read_bytes())
+    assert result.getbuffer().nbytes < os.path.getsize(gif_image)
+    assert format_for(result, from_suffix=False) == "GIF"
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, None])
+def test_optimize_gifs(
+    gif_image: pathlib.Path, tmp_path: pathlib.Path, max_workers: int | None
+):
+    shutil.copy(gif_image, tmp_path / "inplace.gif")
+    jobs = [
+        (gif_image, tmp_path / "out.gif"),
+        (tmp_path / "inplace.gif", tmp_path / "inplace.gif"),
+    ]
+    assert optimize_gifs(jobs, max_workers=max_workers) == [dst for _, dst in jobs]
+    for _, dst in jobs:
+        assert os.path.getsize(dst) < os.path.getsize(gif_image)
+
+
+def test_optimize_gif_bytes(gif_image: pathlib.Path):
+    src = gif_image.read_bytes()
+    result = optimize_gif_bytes(src)
+    assert len(result) < len(src)
+    assert format_for(io.BytesIO(result), from_suffix=False) == "GIF"
+
+
+def test_optimize_gif_bytes_not_gif(png_image: pathlib.Path):
+    with pytest.raises(ValueError, match="is not of format GIF"):
+        optimize_gif_bytes(png_image.read_bytes())
+
+
+def test_optimize_gifs_empty():
+    assert optimize_gifs([]) == []
+
+
+def test_optimize_gifs_not_gif(png_image: pathlib.Path, tmp_path: pathlib.Path):
+    dst = tmp_path / "out.gif"
+    with pytest.raises(ValueError, match="is not of format GIF"):
+        optimize_gifs([(png_image, dst)])
+    assert not dst.exists()
+
+
 @pytest.mark.parametrize(
     "fmt, preset",
     [